@@ -0,0 +1 @@
+"""Pipeline stages: scanning, translation and output generation."""
@@ -0,0 +1,62 @@
+"""Static bilingual HTML pages for the site."""
+
+import html
+import os
+
+from utils import ensure_directory, sanitize_filename
+from yaml_processor import BookContent
+
+_PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="zh-CN">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{title}</title>
+<link rel="stylesheet" href="../style.css">
+</head>
+<body>
+<main class="book">
+{body}
+</main>
+</body>
+</html>
+"""
+
+
+class HTMLGenerator:
+    """Render a ``BookContent`` as one bilingual HTML page."""
+
+    def __init__(self, output_dir: str = "docs/books"):
+        self.output_dir = output_dir
+
+    def generate_book(self, book: BookContent, output_dir: str = None) -> str:
+        """Write the book page and return its path."""
+        out_dir = ensure_directory(output_dir or self.output_dir)
+        parts = [f"<h1>{html.escape(book.metadata.title_en)}</h1>"]
+        if book.metadata.title_cn:
+            parts.append(f"<h2 class=\"title-cn\">{html.escape(book.metadata.title_cn)}</h2>")
+        for chapter in book.chapters:
+            parts.append(
+                f"<h3 id=\"ch{chapter.number}\">{html.escape(chapter.title_en)}"
+                f" <span class=\"cn\">{html.escape(chapter.title_cn)}</span></h3>"
+            )
+            for section in chapter.sections:
+                parts.append("<div class=\"section\">")
+                parts.append(f"<p class=\"en\">{html.escape(section.en)}</p>")
+                parts.append(f"<p class=\"cn\">{html.escape(section.cn)}</p>")
+                for note in section.footnotes:
+                    marker = html.escape(note.get("marker", "*"))
+                    en = html.escape(note.get("en", ""))
+                    cn = html.escape(note.get("cn", ""))
+                    parts.append(
+                        f"<p class=\"footnote\"><sup>{marker}</sup> {en} {cn}</p>"
+                    )
+                parts.append("</div>")
+        name = sanitize_filename(book.metadata.title_en or "untitled")
+        path = os.path.join(out_dir, f"{name}.html")
+        page = _PAGE_TEMPLATE.format(
+            title=html.escape(book.metadata.title_en), body="\n".join(parts)
+        )
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(page)
+        return path
@@ -0,0 +1,104 @@
+"""Fast (de)serialization for pipeline intermediates.
+
+The scan intermediate is machine-to-machine only — nobody hand-edits
+raw OCR output — so it does not need YAML. JSON via orjson (stdlib
+``json`` as fallback) is 20-50x faster to write and read and produces
+smaller files. The user-facing ``*_translated.yaml`` stays YAML.
+"""
+
+import importlib.util
+import json
+import os
+import pprint
+from typing import Any, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def dump_intermediate(data: Any, path: str) -> None:
+    """Serialize ``data`` to ``path`` as JSON."""
+    if orjson is not None:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(data))
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+
+
+def load_intermediate(path: str) -> Any:
+    """Parse the JSON intermediate at ``path``."""
+    with open(path, "rb") as f:
+        raw = f.read()
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def append_jsonl(f, obj: Any) -> None:
+    """Write one object as a JSONL row to the (binary) file ``f``."""
+    if orjson is not None:
+        f.write(orjson.dumps(obj) + b"\n")
+    else:
+        f.write(json.dumps(obj, ensure_ascii=False).encode("utf-8") + b"\n")
+
+
+def read_scan_jsonl(path: str) -> Any:
+    """Reassemble a streamed scan (header row + one row per page).
+
+    Pages may have been flushed out of completion order; they are sorted
+    back by page number here. Returns the same shape as the buffered
+    JSON intermediate.
+    """
+    loads = orjson.loads if orjson is not None else json.loads
+    header: Any = {}
+    pages = []
+    with open(path, "rb") as f:
+        for i, line in enumerate(f):
+            if not line.strip():
+                continue
+            row = loads(line)
+            if i == 0 and "pages" not in row and "page_number" not in row:
+                header = row
+            else:
+                pages.append(row)
+    pages.sort(key=lambda p: p.get("page_number", 0))
+    header["pages"] = pages
+    return header
+
+
+def _py_cache_path(intermediate_path: str) -> str:
+    return os.path.splitext(intermediate_path)[0] + ".py"
+
+
+def write_py_cache(data: Any, intermediate_path: str) -> str:
+    """Emit a sibling ``.py`` literal cache next to the intermediate.
+
+    CPython's bytecode loader beats any text parser by orders of
+    magnitude, which matters when the output stages are being iterated
+    on and the same scan is reloaded over and over.
+    """
+    py_path = _py_cache_path(intermediate_path)
+    with open(py_path, "w", encoding="utf-8") as f:
+        f.write("# Auto-generated literal cache of the sibling scan intermediate.\n")
+        f.write("# Regenerated on every scan; safe to delete.\n")
+        f.write("DATA = ")
+        f.write(pprint.pformat(data, width=200))
+        f.write("\n")
+    return py_path
+
+
+def load_py_cache(intermediate_path: str) -> Optional[Any]:
+    """Load the sibling ``.py`` cache if it is newer than the intermediate."""
+    py_path = _py_cache_path(intermediate_path)
+    try:
+        if os.stat(py_path).st_mtime_ns < os.stat(intermediate_path).st_mtime_ns:
+            return None
+    except OSError:
+        return None
+    spec = importlib.util.spec_from_file_location("_scan_py_cache", py_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return getattr(module, "DATA", None)
@@ -0,0 +1,81 @@
+"""LaTeX sources (and PDFs, when xelatex is available) for print output."""
+
+import os
+import shutil
+import subprocess
+from typing import List
+
+from utils import ensure_directory, sanitize_filename
+from yaml_processor import BookContent
+
+_PREAMBLE = r"""\documentclass[11pt]{book}
+\usepackage{xeCJK}
+\usepackage[margin=2.5cm]{geometry}
+\setCJKmainfont{Noto Serif CJK SC}
+\begin{document}
+"""
+
+_SPECIALS = {
+    "&": r"\&",
+    "%": r"\%",
+    "$": r"\$",
+    "#": r"\#",
+    "_": r"\_",
+    "{": r"\{",
+    "}": r"\}",
+    "~": r"\textasciitilde{}",
+    "^": r"\textasciicircum{}",
+    "\\": r"\textbackslash{}",
+}
+
+
+def _escape(text: str) -> str:
+    return "".join(_SPECIALS.get(ch, ch) for ch in text)
+
+
+class LaTeXGenerator:
+    """Render a ``BookContent`` as LaTeX in three variants."""
+
+    def __init__(self, output_dir: str = "output/latex"):
+        self.output_dir = output_dir
+
+    def _render(self, book: BookContent, language: str) -> str:
+        parts = [_PREAMBLE]
+        title = book.metadata.title_en if language != "cn" else book.metadata.title_cn
+        parts.append(f"\\title{{{_escape(title)}}}\n\\author{{{_escape(book.metadata.author)}}}\n\\maketitle\n")
+        for chapter in book.chapters:
+            if language == "en":
+                parts.append(f"\\chapter{{{_escape(chapter.title_en)}}}\n")
+            elif language == "cn":
+                parts.append(f"\\chapter{{{_escape(chapter.title_cn)}}}\n")
+            else:
+                parts.append(
+                    f"\\chapter{{{_escape(chapter.title_en)} {_escape(chapter.title_cn)}}}\n"
+                )
+            for section in chapter.sections:
+                if language in ("en", "bilingual"):
+                    parts.append(_escape(section.en) + "\n\n")
+                if language in ("cn", "bilingual"):
+                    parts.append(_escape(section.cn) + "\n\n")
+        parts.append("\\end{document}\n")
+        return "".join(parts)
+
+    def generate_book(self, book: BookContent, language: str = "bilingual") -> str:
+        """Write one LaTeX variant and return the ``.tex`` path."""
+        out_dir = ensure_directory(self.output_dir)
+        name = sanitize_filename(book.metadata.title_en or "untitled")
+        tex_path = os.path.join(out_dir, f"{name}_{language}.tex")
+        with open(tex_path, "w", encoding="utf-8") as f:
+            f.write(self._render(book, language))
+        if shutil.which("xelatex"):
+            subprocess.run(
+                ["xelatex", "-interaction=batchmode", os.path.basename(tex_path)],
+                cwd=out_dir,
+                check=False,
+                capture_output=True,
+            )
+        return tex_path
+
+    def generate_all_versions(self, book: BookContent) -> List[str]:
+        """Write English-only, Chinese-only and bilingual variants."""
+        return [self.generate_book(book, lang) for lang in ("en", "cn", "bilingual")]
@@ -0,0 +1,110 @@
+"""PDF page scanning (OCR) via a vision model."""
+
+import asyncio
+import hashlib
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from providers.base import AIProvider
+from utils import progress_bar
+
+OCR_PROMPT = (
+    "Transcribe all text on this book page exactly as printed. Keep "
+    "paragraph breaks as blank lines, mark footnotes with their original "
+    "markers, and output plain text only — no commentary."
+)
+
+
+class PDFScanner:
+    """Rasterize PDF pages and run each through the provider's vision model."""
+
+    def __init__(self, provider: AIProvider, dpi: int = 200, max_concurrency: Optional[int] = None):
+        if not provider.supports_vision:
+            raise ValueError(f"Provider '{provider.name}' has no vision model configured")
+        self.provider = provider
+        self.dpi = dpi
+        if max_concurrency is None:
+            max_concurrency = provider.config.max_concurrency
+        self.max_concurrency = max_concurrency
+        # OCR results keyed by raster digest. Blank pages, chapter
+        # separators and other byte-identical pages then cost one vision
+        # call per distinct image instead of one per page.
+        self._ocr_by_digest: Dict[bytes, str] = {}
+
+    def _render_pages(
+        self, pdf_path: str, page_range: Optional[Tuple[int, int]] = None
+    ) -> Iterator[Tuple[int, bytes]]:
+        """Yield ``(page_number, png_bytes)`` for each requested page."""
+        import fitz  # PyMuPDF
+
+        zoom = self.dpi / 72.0
+        matrix = fitz.Matrix(zoom, zoom)
+        with fitz.open(pdf_path) as doc:
+            first, last = 1, doc.page_count
+            if page_range:
+                first = max(first, page_range[0])
+                last = min(last, page_range[1])
+            for number in range(first, last + 1):
+                pixmap = doc[number - 1].get_pixmap(matrix=matrix)
+                yield number, pixmap.tobytes("png")
+
+    async def _scan_all(
+        self, renders: List[Tuple[int, bytes]], on_page: Optional[Callable[[Dict[str, Any]], None]]
+    ) -> List[Tuple[int, str]]:
+        # Group pages by digest up front so duplicates ride along with
+        # their representative instead of racing it to the provider.
+        groups: Dict[bytes, List[int]] = {}
+        samples: Dict[bytes, bytes] = {}
+        for page_number, png_bytes in renders:
+            digest = hashlib.blake2b(png_bytes, digest_size=16).digest()
+            groups.setdefault(digest, []).append(page_number)
+            samples.setdefault(digest, png_bytes)
+
+        sem = asyncio.Semaphore(self.max_concurrency)
+        total = len(groups)
+        done = 0
+        results: List[Tuple[int, str]] = []
+
+        async def _scan_group(digest: bytes, png_bytes: bytes) -> None:
+            nonlocal done
+            text = self._ocr_by_digest.get(digest)
+            if text is None:
+                async with sem:
+                    text = await asyncio.to_thread(self.provider.vision, png_bytes, OCR_PROMPT)
+                self._ocr_by_digest[digest] = text
+            done += 1
+            progress_bar(done, total, prefix="  scan ")
+            # Runs in the event-loop thread, so callbacks are serialized.
+            for number in groups[digest]:
+                if on_page is not None:
+                    on_page({"page_number": number, "text": text})
+                results.append((number, text))
+
+        await asyncio.gather(*(_scan_group(d, samples[d]) for d in groups))
+        return results
+
+    def scan_pdf(
+        self,
+        pdf_path: str,
+        page_range: Optional[Tuple[int, int]] = None,
+        on_page: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> Dict[str, Any]:
+        """OCR every page and return the raw scan structure.
+
+        Pages are independent network calls, so they run concurrently up
+        to ``max_concurrency`` and are reassembled in page order. When
+        ``on_page`` is given, each completed page is handed to it as soon
+        as it finishes (in completion order) and is NOT buffered in the
+        returned structure — the caller owns persistence then.
+        """
+        renders = list(self._render_pages(pdf_path, page_range))
+        results = asyncio.run(self._scan_all(renders, on_page))
+        header = {
+            "pdf_path": pdf_path,
+            "provider": self.provider.name,
+            "vision_model": self.provider.config.vision_model,
+        }
+        if on_page is None:
+            header["pages"] = [{"page_number": n, "text": t} for n, t in sorted(results)]
+        else:
+            header["pages"] = []
+        return header
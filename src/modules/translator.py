@@ -0,0 +1,30 @@
+"""Paragraph translation on top of an ``AIProvider``."""
+
+from typing import List, Optional
+
+from providers.base import AIProvider
+
+
+class Translator:
+    """Translate English paragraphs to Chinese via the language model."""
+
+    SYSTEM_PROMPT = (
+        "You are a literary translator. Translate the user's English text "
+        "into fluent, faithful simplified Chinese. Preserve paragraph "
+        "structure and footnote markers. Reply with the translation only."
+    )
+
+    def __init__(self, provider: AIProvider):
+        self.provider = provider
+
+    def translate_paragraph(self, text: str, context: Optional[str] = None) -> str:
+        """Translate one paragraph; optional context steers terminology."""
+        if context:
+            prompt = f"Context:\n{context}\n\nTranslate:\n{text}"
+        else:
+            prompt = text
+        return self.provider.chat(prompt, system_prompt=self.SYSTEM_PROMPT)
+
+    def translate_batch(self, paragraphs: List[str]) -> List[str]:
+        """Translate several paragraphs in one provider round-trip if possible."""
+        return self.provider.chat_batch(list(paragraphs), system_prompt=self.SYSTEM_PROMPT)
@@ -0,0 +1,444 @@
+"""End-to-end book pipeline: PDF -> OCR scan -> translation -> HTML/LaTeX.
+
+Each stage reads and writes files under ``output/`` so stages can be run
+(and re-run) independently from the command line::
+
+    python pipeline.py scan book.pdf
+    python pipeline.py translate output/book_scan.yaml
+    python pipeline.py html output/book_translated.yaml
+"""
+
+import argparse
+import asyncio
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import yaml
+
+# libyaml's C bindings are ~10x faster than pure-Python PyYAML on the
+# multi-hundred-page scan intermediates; fall back when not linked.
+try:
+    from yaml import CSafeDumper as SafeDumper, CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeDumper, SafeLoader
+
+from modules.html_generator import HTMLGenerator
+from modules.intermediate import (
+    append_jsonl,
+    dump_intermediate,
+    load_intermediate,
+    load_py_cache,
+    read_scan_jsonl,
+    write_py_cache,
+)
+from modules.latex_generator import LaTeXGenerator
+from modules.scanner import PDFScanner
+from modules.translator import Translator
+from providers.factory import get_default_provider, get_provider
+from utils import ensure_directory, progress_bar
+from yaml_processor import BookContent, BookMetadata, Chapter, Section, YAMLProcessor
+
+
+# Paragraph boundary: a blank line, tolerating trailing/leading spaces.
+# One compiled-regex pass replaces split('\n\n') plus a strip-and-filter
+# comprehension per page — small, but it runs for every page of every book.
+_PARA_RE = re.compile(r"[ \t]*\n[ \t]*\n[ \t\n]*")
+
+log = logging.getLogger("pipeline")
+
+
+def _start_logging(level: int = logging.INFO) -> None:
+    """Route pipeline logs through a queue drained by a background thread.
+
+    Hot paths (one message per translate batch) then pay only a lock-free
+    queue put instead of a stdout lock plus a write syscall each — under
+    asyncio fan-out, direct prints serialize every worker on stderr.
+    """
+    if log.handlers:
+        return
+    q: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    writer = logging.StreamHandler(sys.stderr)
+    writer.setFormatter(logging.Formatter("%(message)s"))
+    listener = logging.handlers.QueueListener(q, writer)
+    listener.start()
+    atexit.register(listener.stop)
+    log.addHandler(logging.handlers.QueueHandler(q))
+    log.setLevel(level)
+
+
+# (rpm, max in-flight calls) each provider tolerates; Ollama is local so
+# RPM is effectively unbounded but the hardware only fits a couple of
+# concurrent generations.
+_PROVIDER_PROFILES: Dict[str, Tuple[int, int]] = {
+    "qwen": (60, 8),
+    "openai": (60, 10),
+    "anthropic": (50, 5),
+    "gemini": (60, 8),
+    "ollama": (1000, 2),
+}
+
+
+class BookPipeline:
+    """Orchestrates the scan, translate and generate stages."""
+
+    def __init__(self, provider_name: Optional[str] = None, output_dir: str = "output"):
+        name = (provider_name or get_default_provider()).lower()
+        profile = _PROVIDER_PROFILES.get(name)
+        if profile:
+            # Passing the profile as field kwargs takes the factory's
+            # uncached path, so this pipeline gets its own instance —
+            # mutating the shared cached provider would leak the profile
+            # into every other get_provider() caller in the process.
+            self.provider = get_provider(name, rpm=profile[0], max_concurrency=profile[1])
+        else:
+            self.provider = get_provider(name)
+        self.output_dir = output_dir
+        self.scanner = PDFScanner(self.provider)
+        self.translator = Translator(self.provider)
+        self.yaml_processor = YAMLProcessor()
+        self.html_generator = HTMLGenerator()
+        self.latex_generator = LaTeXGenerator()
+
+    # ------------------------------------------------------------------
+    # scan
+    # ------------------------------------------------------------------
+    def scan_pdf(
+        self,
+        pdf_path: str,
+        output_path: Optional[str] = None,
+        page_range: Optional[Tuple[int, int]] = None,
+        legacy_yaml: bool = False,
+    ) -> str:
+        """OCR the PDF into a raw scan intermediate; returns its path.
+
+        The default format is JSONL, streamed: a header row up front,
+        then one row per page flushed the moment its OCR finishes. Peak
+        memory stays at one page regardless of book size, and a crashed
+        run leaves every completed page on disk. ``legacy_yaml`` keeps
+        the old buffered ``*_scan.yaml`` format.
+        """
+        print(f"Scanning {pdf_path} with {self.provider.name}...")
+        if output_path is None:
+            base = os.path.splitext(os.path.basename(pdf_path))[0]
+            suffix = "yaml" if legacy_yaml else "jsonl"
+            output_path = os.path.join(self.output_dir, f"{base}_scan.{suffix}")
+        ensure_directory(os.path.dirname(output_path) or ".")
+        if legacy_yaml or output_path.endswith((".yaml", ".yml")):
+            temp_data = self.scanner.scan_pdf(pdf_path, page_range=page_range)
+            with open(output_path, "w", encoding="utf-8") as f:
+                yaml.dump(
+                    temp_data,
+                    f,
+                    Dumper=SafeDumper,
+                    allow_unicode=True,
+                    default_flow_style=False,
+                    sort_keys=False,
+                )
+        elif output_path.endswith(".jsonl"):
+            with open(output_path, "wb") as f:
+                append_jsonl(
+                    f,
+                    {
+                        "pdf_path": pdf_path,
+                        "provider": self.provider.name,
+                        "vision_model": self.provider.config.vision_model,
+                    },
+                )
+
+                def _flush_page(page: Dict[str, Any]) -> None:
+                    append_jsonl(f, page)
+                    f.flush()
+
+                self.scanner.scan_pdf(pdf_path, page_range=page_range, on_page=_flush_page)
+        else:
+            temp_data = self.scanner.scan_pdf(pdf_path, page_range=page_range)
+            dump_intermediate(temp_data, output_path)
+        # Literal .py sibling: near-instant reloads while iterating on
+        # the translate/HTML/PDF stages against the same scan.
+        if output_path.endswith(".jsonl"):
+            write_py_cache(read_scan_jsonl(output_path), output_path)
+        elif not legacy_yaml:
+            write_py_cache(temp_data, output_path)
+        print(f"Scan written to {output_path}")
+        return output_path
+
+    # ------------------------------------------------------------------
+    # translate
+    # ------------------------------------------------------------------
+    #: Paragraphs bundled into one chat_batch round-trip. One batched
+    #: request costs 1 RPM instead of K, which matters more than latency
+    #: once the rate limiter is the bottleneck.
+    BATCH_SIZE = 8
+
+    async def _translate_batch(
+        self, sem: asyncio.Semaphore, batch: List[Tuple[int, str]], partial_f=None
+    ) -> List[Tuple[int, str]]:
+        async with sem:
+            log.debug("translating sections %d-%d", batch[0][0], batch[-1][0])
+            translations = await asyncio.to_thread(
+                self.translator.translate_batch, [para for _, para in batch]
+            )
+            done = [(idx, cn) for (idx, _), cn in zip(batch, translations)]
+            if partial_f is not None:
+                # Runs on the event-loop thread, so appends never interleave.
+                for (idx, en), (_, cn) in zip(batch, done):
+                    append_jsonl(partial_f, {"id": idx, "en": en, "cn": cn})
+                partial_f.flush()
+            return done
+
+    async def _translate_all(
+        self, jobs: List[Tuple[int, str]], max_concurrency: int, partial_f=None
+    ) -> Dict[int, str]:
+        sem = asyncio.Semaphore(max_concurrency)
+        batches = [jobs[i : i + self.BATCH_SIZE] for i in range(0, len(jobs), self.BATCH_SIZE)]
+        results: Dict[int, str] = {}
+        done = 0
+        # as_completed keeps the progress bar on the event-loop thread,
+        # one redraw per finished batch rather than one per section.
+        for fut in asyncio.as_completed(
+            [self._translate_batch(sem, b, partial_f) for b in batches]
+        ):
+            results.update(await fut)
+            done += 1
+            progress_bar(done, len(batches), prefix="  translate ")
+        return results
+
+    @staticmethod
+    def _load_partial(partial_path: str) -> Dict[int, str]:
+        """Translations salvaged from an interrupted run, keyed by section id."""
+        recovered: Dict[int, str] = {}
+        try:
+            with open(partial_path, "rb") as f:
+                for line in f:
+                    if line.strip():
+                        row = json.loads(line)
+                        recovered[row["id"]] = row["cn"]
+        except OSError:
+            pass
+        return recovered
+
+    def translate_content(
+        self,
+        scan_path: str,
+        output_yaml: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+    ) -> str:
+        """Translate every scanned paragraph and build the book YAML.
+
+        Translation calls are pure network round-trips, so they are
+        dispatched concurrently (bounded by ``max_concurrency``, or the
+        provider's ``extra["max_concurrency"]``, default 10) and then
+        reassembled in page order. The scan intermediate is dispatched
+        on suffix: JSON (current) or legacy YAML.
+        """
+        scan_data = load_py_cache(scan_path)
+        if scan_data is None:
+            if scan_path.endswith((".yaml", ".yml")):
+                with open(scan_path, "r", encoding="utf-8") as f:
+                    scan_data = yaml.load(f, Loader=SafeLoader)
+            elif scan_path.endswith(".jsonl"):
+                scan_data = read_scan_jsonl(scan_path)
+            else:
+                scan_data = load_intermediate(scan_path)
+
+        # Flatten pages into (section_id, paragraph) jobs first so the
+        # whole book shares one concurrency budget.
+        jobs: List[Tuple[int, str]] = []
+        page_sections: List[Tuple[int, List[int]]] = []
+        next_id = 1
+        for page in scan_data.get("pages", []):
+            content = page.get("text", "") or ""
+            paragraphs = [p for p in _PARA_RE.split(content.strip()) if p]
+            ids = []
+            for para in paragraphs:
+                jobs.append((next_id, para))
+                ids.append(next_id)
+                next_id += 1
+            page_sections.append((page.get("page_number", len(page_sections) + 1), ids))
+
+        if max_concurrency is None:
+            max_concurrency = int(
+                self.provider.config.extra.get(
+                    "max_concurrency", self.provider.config.max_concurrency
+                )
+            )
+
+        base = os.path.splitext(os.path.basename(scan_data.get("pdf_path", scan_path)))[0]
+        if output_yaml is None:
+            output_yaml = os.path.join(self.output_dir, f"{base}_translated.yaml")
+
+        # Sections finished by an interrupted earlier run are replayed from
+        # the partial sidecar instead of re-translated; a crash mid-run
+        # costs only the remainder on restart.
+        partial_path = f"{output_yaml}.partial.jsonl"
+        translations = self._load_partial(partial_path)
+        pending = [job for job in jobs if job[0] not in translations]
+        if translations:
+            print(f"Resuming: {len(translations)} sections recovered from {partial_path}")
+        print(f"Translating {len(pending)} sections ({max_concurrency} in flight)...")
+        if pending:
+            ensure_directory(os.path.dirname(partial_path) or ".")
+            with open(partial_path, "ab") as partial_f:
+                translations.update(
+                    asyncio.run(self._translate_all(pending, max_concurrency, partial_f))
+                )
+
+        paragraphs_by_id = dict(jobs)
+        chapters = []
+        for page_number, ids in page_sections:
+            if not ids:
+                continue
+            sections = [
+                Section(id=i, en=paragraphs_by_id[i], cn=translations[i]) for i in ids
+            ]
+            chapters.append(
+                Chapter(
+                    number=page_number,
+                    title_en=f"Page {page_number}",
+                    title_cn=f"第{page_number}页",
+                    sections=sections,
+                )
+            )
+
+        book = BookContent(
+            metadata=BookMetadata(title_en=base.replace("_", " ")),
+            chapters=chapters,
+        )
+        self.yaml_processor.save_book(book, output_yaml)
+        # The final YAML now holds everything; the sidecar has served its
+        # purpose and would otherwise mask the next book's fresh run.
+        try:
+            os.remove(partial_path)
+        except OSError:
+            pass
+        print(f"Translated book written to {output_yaml}")
+        return output_yaml
+
+    # ------------------------------------------------------------------
+    # generate
+    # ------------------------------------------------------------------
+    def generate_html(self, yaml_path: str) -> str:
+        """Render the translated book as HTML; returns the page path."""
+        book = self.yaml_processor.load_book(yaml_path)
+        return self.html_generator.generate_book(book)
+
+    def generate_pdfs(self, yaml_path: str) -> List[str]:
+        """Render the translated book as LaTeX/PDF variants."""
+        book = self.yaml_processor.load_book(yaml_path)
+        return self.latex_generator.generate_all_versions(book)
+
+    def generate_html_batch(self, yaml_paths: List[str]) -> List[str]:
+        """Render several books' HTML across CPU cores.
+
+        YAML parsing plus template rendering is compute-bound and each
+        book is independent, so the batch forms scale near-linearly with
+        cores. Each worker builds its own processor and generator — the
+        provider (with its live client) never crosses the pickle boundary.
+        """
+        if len(yaml_paths) == 1:
+            return [self.generate_html(yaml_paths[0])]
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as ex:
+            return list(ex.map(_generate_html_one, yaml_paths))
+
+    def generate_pdfs_batch(self, yaml_paths: List[str]) -> List[List[str]]:
+        """Render several books' LaTeX/PDF variants across CPU cores."""
+        if len(yaml_paths) == 1:
+            return [self.generate_pdfs(yaml_paths[0])]
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as ex:
+            return list(ex.map(_generate_pdfs_one, yaml_paths))
+
+    def run_full_pipeline(
+        self,
+        pdf_path: str,
+        title_en: Optional[str] = None,
+        title_cn: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Run scan -> translate -> HTML -> LaTeX for one PDF."""
+        scan_yaml = self.scan_pdf(pdf_path)
+        translated_yaml = self.translate_content(scan_yaml)
+        book = self.yaml_processor.load_book(translated_yaml)
+        if title_en:
+            book.metadata.title_en = title_en
+        if title_cn:
+            book.metadata.title_cn = title_cn
+        self.yaml_processor.save_book(book, translated_yaml)
+        # Hand the in-memory book straight to the generators; reloading
+        # the YAML we just wrote would only reparse identical data.
+        html_path = self.html_generator.generate_book(book)
+        pdf_paths = self.latex_generator.generate_all_versions(book)
+        return {
+            "scan": scan_yaml,
+            "translated": translated_yaml,
+            "html": html_path,
+            "pdfs": pdf_paths,
+        }
+
+
+# Module-level so ProcessPoolExecutor can pickle them by reference; the
+# generators are rebuilt inside each worker.
+def _generate_html_one(yaml_path: str) -> str:
+    return HTMLGenerator().generate_book(YAMLProcessor().load_book(yaml_path))
+
+
+def _generate_pdfs_one(yaml_path: str) -> List[str]:
+    return LaTeXGenerator().generate_all_versions(YAMLProcessor().load_book(yaml_path))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bilingual book pipeline")
+    parser.add_argument("--provider", help="AI provider name (default from .env)")
+    parser.add_argument(
+        "--verbose", action="store_true", help="log per-batch progress detail"
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_scan = sub.add_parser("scan", help="OCR a PDF into a scan intermediate")
+    p_scan.add_argument("pdf_path")
+    p_scan.add_argument("--pages", help="page range, e.g. 5-120")
+    p_scan.add_argument(
+        "--legacy-yaml", action="store_true", help="write the old YAML scan format"
+    )
+
+    p_translate = sub.add_parser("translate", help="translate a scan intermediate")
+    p_translate.add_argument("scan_path")
+    p_translate.add_argument("--concurrency", type=int, default=None)
+
+    p_html = sub.add_parser("html", help="generate the HTML page(s)")
+    p_html.add_argument("yaml_paths", nargs="+")
+
+    p_pdf = sub.add_parser("pdf", help="generate LaTeX/PDF variants")
+    p_pdf.add_argument("yaml_paths", nargs="+")
+
+    p_full = sub.add_parser("full", help="run the whole pipeline")
+    p_full.add_argument("pdf_path")
+
+    args = parser.parse_args()
+    _start_logging(logging.DEBUG if args.verbose else logging.INFO)
+    pipeline = BookPipeline(provider_name=args.provider)
+    if args.command == "scan":
+        page_range = None
+        if args.pages:
+            first, _, last = args.pages.partition("-")
+            page_range = (int(first), int(last or first))
+        pipeline.scan_pdf(args.pdf_path, page_range=page_range, legacy_yaml=args.legacy_yaml)
+    elif args.command == "translate":
+        pipeline.translate_content(args.scan_path, max_concurrency=args.concurrency)
+    elif args.command == "html":
+        print("\n".join(pipeline.generate_html_batch(args.yaml_paths)))
+    elif args.command == "pdf":
+        for paths in pipeline.generate_pdfs_batch(args.yaml_paths):
+            print("\n".join(paths))
+    elif args.command == "full":
+        pipeline.run_full_pipeline(args.pdf_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""AI provider backends (Qwen, OpenAI, Anthropic, Gemini, Ollama)."""
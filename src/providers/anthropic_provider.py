@@ -0,0 +1,137 @@
+"""Anthropic (Claude) provider."""
+
+import re
+from functools import lru_cache
+from typing import List, Optional
+
+from providers.base import AIProvider, ProviderConfig, encode_image_base64
+from providers.cache import cached_chat, cached_vision
+
+_BATCH_MARKER_RE = re.compile(r"\[\[(\d+)\]\]")
+
+_MEDIA_TYPES = {
+    "png": "image/png",
+    "jpg": "image/jpeg",
+    "jpeg": "image/jpeg",
+    "webp": "image/webp",
+    "gif": "image/gif",
+}
+
+_BATCH_INSTRUCTION = (
+    "Answer each numbered item below independently. Prefix every answer "
+    "with its [[n]] marker on its own line and add nothing else.\n\n"
+)
+
+
+@lru_cache(maxsize=4)
+def _shared_client(api_key: Optional[str]):
+    """One pooled SDK client per API key for the whole process.
+
+    Under concurrent fan-out, per-call TCP/TLS setup dominates tail
+    latency; a shared httpx pool amortizes handshakes and DNS across
+    every provider instance built with the same key.
+    """
+    import anthropic
+    import httpx
+
+    http_client = httpx.Client(
+        limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+        timeout=60.0,
+    )
+    return anthropic.Anthropic(api_key=api_key, http_client=http_client)
+
+
+class AnthropicProvider(AIProvider):
+    """Claude chat and vision via the official ``anthropic`` SDK."""
+
+    name = "anthropic"
+
+    def _initialize_client(self) -> None:
+        self._client = _shared_client(self.config.api_key)
+
+    @cached_chat
+    def chat(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+        kwargs = {
+            "model": self.config.language_model,
+            "max_tokens": self.config.max_tokens,
+            "temperature": self.config.temperature,
+            "messages": [{"role": "user", "content": prompt}],
+        }
+        if system_prompt:
+            kwargs["system"] = system_prompt
+
+        def _call():
+            # Streaming overlaps network transfer with generation: chunks
+            # accumulate as they arrive instead of blocking until the
+            # full completion is serialized and returned.
+            parts = []
+            with self.client.messages.stream(**kwargs) as stream:
+                for text in stream.text_stream:
+                    parts.append(text)
+            return "".join(parts)
+
+        return self._retry_with_backoff(_call)
+
+    def chat_batch(self, prompts: List[str], system_prompt: Optional[str] = None) -> List[str]:
+        """Bundle K prompts into one request and split the reply on markers.
+
+        One round-trip instead of K keeps RPM pressure down and reuses
+        the system-prompt prefix. If the reply cannot be parsed back into
+        exactly K answers, fall back to per-prompt calls for parity.
+        """
+        if len(prompts) <= 1:
+            return [self.chat(p, system_prompt=system_prompt) for p in prompts]
+        body = _BATCH_INSTRUCTION + "\n\n".join(
+            f"[[{i}]] {p}" for i, p in enumerate(prompts, 1)
+        )
+        text = self.chat(body, system_prompt=system_prompt)
+        parts = _BATCH_MARKER_RE.split(text)
+        answers = {}
+        for j in range(1, len(parts) - 1, 2):
+            answers[int(parts[j])] = parts[j + 1].strip()
+        if set(answers) != set(range(1, len(prompts) + 1)):
+            return [self.chat(p, system_prompt=system_prompt) for p in prompts]
+        return [answers[i] for i in range(1, len(prompts) + 1)]
+
+    @cached_vision
+    def vision(self, image_data: bytes, prompt: str, image_format: str = "png") -> str:
+        image_base64 = encode_image_base64(image_data)
+        media_type = _MEDIA_TYPES.get(image_format.lower(), "image/png")
+        messages = [
+            {
+                "role": "user",
+                "content": [
+                    {
+                        "type": "image",
+                        "source": {
+                            "type": "base64",
+                            "media_type": media_type,
+                            "data": image_base64,
+                        },
+                    },
+                    {"type": "text", "text": prompt},
+                ],
+            }
+        ]
+
+        def _call():
+            response = self.client.messages.create(
+                model=self.config.vision_model,
+                max_tokens=self.config.max_tokens,
+                temperature=0.1,
+                messages=messages,
+            )
+            return response.content[0].text
+
+        return self._retry_with_backoff(_call)
+
+
+def create_anthropic_provider(api_key: Optional[str] = None, **kwargs) -> AnthropicProvider:
+    """Build an ``AnthropicProvider`` with sensible model defaults."""
+    config = ProviderConfig.from_raw(
+        api_key=api_key,
+        vision_model=kwargs.pop("vision_model", "claude-3-5-sonnet-20241022"),
+        language_model=kwargs.pop("language_model", "claude-3-5-sonnet-20241022"),
+        **kwargs,
+    )
+    return AnthropicProvider(config)
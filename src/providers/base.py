@@ -0,0 +1,285 @@
+"""Shared interface for the AI provider backends."""
+
+import base64
+import hashlib
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+
+@dataclass(frozen=True, slots=True)
+class ProviderConfig:
+    """Runtime settings shared by every provider.
+
+    Frozen and slotted: the fields are read on every chat/vision call,
+    so attribute access skips the instance ``__dict__``, and nothing can
+    mutate a config out from under a provider mid-run. Use ``from_raw``
+    (or ``dataclasses.replace``) to build variants.
+    """
+
+    api_key: Optional[str] = None
+    vision_model: str = ""
+    language_model: str = ""
+    max_tokens: int = 4096
+    temperature: float = 0.3
+    top_p: float = 0.9
+    max_retries: int = 3
+    retry_delay: float = 1.0
+    base_url: Optional[str] = None
+    # Concurrency profile: requests per minute the provider tolerates and
+    # how many calls we keep in flight at once.
+    rpm: int = 60
+    max_concurrency: int = 5
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_raw(cls, **kwargs) -> "ProviderConfig":
+        """Construct from possibly-unclamped raw values (env strings etc.).
+
+        Keys that are not config fields (``cache_dir``,
+        ``cache_responses``, ``tpm``, ...) are swept into ``extra``,
+        mirroring how the factory routes leftover settings.
+        """
+        unknown = [k for k in kwargs if k not in cls.__dataclass_fields__]
+        if unknown:
+            extra = dict(kwargs.pop("extra", None) or {})
+            for k in unknown:
+                extra[k] = kwargs.pop(k)
+            kwargs["extra"] = extra
+        if "temperature" in kwargs:
+            kwargs["temperature"] = min(2.0, max(0.0, float(kwargs["temperature"])))
+        if "max_tokens" in kwargs:
+            kwargs["max_tokens"] = max(1, int(kwargs["max_tokens"]))
+        if "max_retries" in kwargs:
+            kwargs["max_retries"] = max(0, int(kwargs["max_retries"]))
+        return cls(**kwargs)
+
+
+class RateLimiter:
+    """Proactive sliding-window limiter over requests and tokens per minute.
+
+    ``acquire`` blocks until a call fits under both budgets, so batch
+    workloads pace themselves instead of slamming into 429s and paying
+    full backoff. The effective request rate adapts AIMD-style: halved
+    when the provider rate-limits us, grown additively (up to the
+    configured ceiling) on success.
+    """
+
+    WINDOW = 60.0
+
+    def __init__(self, rpm: int, tpm: Optional[int] = None):
+        self.base_rpm = max(1, rpm)
+        self.rpm = float(self.base_rpm)
+        self.tpm = float(tpm) if tpm else None
+        self._requests: deque = deque()
+        self._token_events: deque = deque()
+        self._token_total = 0
+        self._lock = threading.Lock()
+
+    def _trim(self, now: float) -> None:
+        cutoff = now - self.WINDOW
+        while self._requests and self._requests[0] <= cutoff:
+            self._requests.popleft()
+        while self._token_events and self._token_events[0][0] <= cutoff:
+            self._token_total -= self._token_events.popleft()[1]
+
+    def acquire(self, tokens_estimate: int = 0) -> None:
+        """Block until one request (of ``tokens_estimate`` tokens) fits."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._trim(now)
+                over_rpm = len(self._requests) >= self.rpm
+                over_tpm = (
+                    self.tpm is not None
+                    and self._token_events
+                    and self._token_total + tokens_estimate > self.tpm
+                )
+                if not over_rpm and not over_tpm:
+                    self._requests.append(now)
+                    if tokens_estimate:
+                        self._token_events.append((now, tokens_estimate))
+                        self._token_total += tokens_estimate
+                    return
+                oldest = self._requests[0] if over_rpm else self._token_events[0][0]
+                wait = max(0.05, oldest + self.WINDOW - now)
+            time.sleep(wait)
+
+    def on_rate_limit(self) -> None:
+        """Multiplicative decrease after a 429."""
+        with self._lock:
+            self.rpm = max(1.0, self.rpm * 0.5)
+
+    def on_success(self) -> None:
+        """Additive increase back toward the configured ceiling."""
+        with self._lock:
+            if self.rpm < self.base_rpm:
+                self.rpm = min(float(self.base_rpm), self.rpm + 1.0)
+
+
+#: Recent base64 payloads keyed by content digest. OCR pipelines
+#: re-submit the same page bytes (retries, duplicate pages), and
+#: re-encoding a multi-MB PNG each time is pure allocation churn.
+_b64_cache: "OrderedDict[bytes, str]" = OrderedDict()
+_B64_CACHE_ENTRIES = 8
+_B64_CACHE_MAX_BYTES = 8 * 1024 * 1024
+
+
+def encode_image_base64(image_data: bytes) -> str:
+    """Base64 an image payload, memoizing recent encodings by digest.
+
+    The ascii decode takes CPython's fast path (base64 output is pure
+    ASCII); payloads over 8 MB bypass the cache so a handful of huge
+    scans cannot pin hundreds of MB.
+    """
+    if isinstance(image_data, (bytearray, memoryview)):
+        image_data = bytes(image_data)
+    if len(image_data) > _B64_CACHE_MAX_BYTES:
+        return base64.b64encode(image_data).decode("ascii")
+    digest = hashlib.blake2b(image_data, digest_size=16).digest()
+    encoded = _b64_cache.get(digest)
+    if encoded is None:
+        encoded = base64.b64encode(image_data).decode("ascii")
+        _b64_cache[digest] = encoded
+        if len(_b64_cache) > _B64_CACHE_ENTRIES:
+            _b64_cache.popitem(last=False)
+    else:
+        _b64_cache.move_to_end(digest)
+    return encoded
+
+
+def _is_rate_limit_error(error: Exception) -> bool:
+    if getattr(error, "status_code", None) == 429:
+        return True
+    name = type(error).__name__
+    return "RateLimit" in name or "rate limit" in str(error).lower()
+
+
+#: HTTP statuses worth retrying: rate limits and transient server errors.
+_RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+
+#: Exception-name fragments that signal transient trouble across the
+#: different SDKs without importing any of them here.
+_RETRYABLE_NAME_HINTS = ("RateLimit", "Timeout", "Connection", "Overloaded", "ServiceUnavailable")
+
+
+def _is_retryable_error(error: Exception) -> bool:
+    """Transient errors get retried; programming/auth errors fail fast."""
+    status = getattr(error, "status_code", None)
+    if status is not None:
+        return status in _RETRYABLE_STATUS
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    name = type(error).__name__
+    return any(hint in name for hint in _RETRYABLE_NAME_HINTS)
+
+
+def _retry_after_seconds(error: Exception) -> Optional[float]:
+    """The server's own retry-after hint, when one is attached."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if headers is None:
+        return None
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class AIProvider(ABC):
+    """Base class for chat/vision model providers.
+
+    Subclasses implement ``_initialize_client``, ``chat`` and ``vision``;
+    the client is created lazily on first use so importing a provider
+    module never pulls in its SDK.
+    """
+
+    name = "base"
+
+    def __init__(self, config: ProviderConfig):
+        self.config = config
+        self._client = None
+        self._limiter: Optional[RateLimiter] = None
+
+    @abstractmethod
+    def _initialize_client(self) -> None:
+        """Create the underlying SDK client."""
+
+    @abstractmethod
+    def chat(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+        """Send a text prompt to the language model and return its reply."""
+
+    @abstractmethod
+    def vision(self, image_data: bytes, prompt: str, image_format: str = "png") -> str:
+        """Send an image plus prompt to the vision model and return the text."""
+
+    def chat_batch(self, prompts: List[str], system_prompt: Optional[str] = None) -> List[str]:
+        """Answer several independent prompts, in order.
+
+        The base implementation just loops over ``chat``; providers that
+        can bundle prompts into one request should override this.
+        """
+        return [self.chat(p, system_prompt=system_prompt) for p in prompts]
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._initialize_client()
+        return self._client
+
+    @property
+    def supports_vision(self) -> bool:
+        return bool(self.config.vision_model)
+
+    @property
+    def limiter(self) -> RateLimiter:
+        # Built lazily so callers may swap self.config (e.g. to apply a
+        # concurrency profile) before the first call.
+        if self._limiter is None:
+            tpm = self.config.extra.get("tpm")
+            self._limiter = RateLimiter(self.config.rpm, int(tpm) if tpm else None)
+        return self._limiter
+
+    def _retry_with_backoff(self, func: Callable, *args, estimated_tokens: Optional[int] = None, **kwargs):
+        """Call ``func``, pacing via the rate limiter and retrying on failure.
+
+        ``estimated_tokens`` sizes the call against the TPM budget; it
+        defaults to the configured completion ceiling.
+        """
+        if estimated_tokens is None:
+            estimated_tokens = self.config.max_tokens
+        last_error = None
+        limiter = self.limiter
+        for attempt in range(self.config.max_retries + 1):
+            limiter.acquire(estimated_tokens)
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                last_error = e
+                if _is_rate_limit_error(e):
+                    limiter.on_rate_limit()
+                if not _is_retryable_error(e):
+                    # Auth failures, bad requests and plain bugs will not
+                    # get better with backoff — surface them immediately.
+                    raise
+                if attempt == self.config.max_retries:
+                    break
+                delay = _retry_after_seconds(e)
+                if delay is None:
+                    delay = self.config.retry_delay * (2 ** attempt)
+                print(f"  {self.name}: attempt {attempt + 1} failed ({e}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+            else:
+                limiter.on_success()
+                return result
+        raise last_error
+
+    def validate_connection(self) -> bool:
+        """Cheap smoke test that the provider is reachable and configured."""
+        try:
+            return bool(self.chat("ping"))
+        except Exception:
+            return False
@@ -0,0 +1,153 @@
+"""Disk-backed response cache for provider calls.
+
+Books repeat themselves — scripture quotations, epigraphs, running
+heads — and repeat pipeline runs resend identical prompts. Caching on a
+content hash lets those calls skip the API entirely. The cache is off
+unless ``config.extra["cache_dir"]`` is set.
+"""
+
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from functools import wraps
+from typing import Dict, Optional
+
+try:
+    import diskcache
+except ImportError:  # pragma: no cover - optional dependency
+    diskcache = None
+
+
+def response_key(
+    provider: str,
+    model: str,
+    system_prompt: Optional[str],
+    prompt: str,
+    image_data: Optional[bytes] = None,
+) -> str:
+    """Stable hash of everything that determines a response."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{provider}|{model}|{system_prompt or ''}|{prompt}".encode("utf-8"))
+    if image_data:
+        h.update(image_data)
+    return h.hexdigest()
+
+
+class ResponseCache:
+    """Persistent string cache under a directory.
+
+    Uses ``diskcache`` when installed; otherwise a dependency-free
+    one-file-per-key JSON layout.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        if diskcache is not None:
+            self._cache = diskcache.Cache(cache_dir)
+        else:
+            os.makedirs(cache_dir, exist_ok=True)
+            self._cache = None
+
+    def get(self, key: str) -> Optional[str]:
+        if self._cache is not None:
+            return self._cache.get(key)
+        path = os.path.join(self.cache_dir, f"{key}.json")
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)["response"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def set(self, key: str, value: str) -> None:
+        if self._cache is not None:
+            self._cache.set(key, value)
+            return
+        path = os.path.join(self.cache_dir, f"{key}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"response": value}, f, ensure_ascii=False)
+
+
+_caches: Dict[str, ResponseCache] = {}
+
+
+def _cache_for(provider) -> Optional[ResponseCache]:
+    cache_dir = provider.config.extra.get("cache_dir")
+    if not cache_dir:
+        return None
+    cache = _caches.get(cache_dir)
+    if cache is None:
+        cache = _caches[cache_dir] = ResponseCache(cache_dir)
+    return cache
+
+
+def cached_chat(func):
+    """Memoize a provider ``chat`` method on (provider, model, prompts)."""
+
+    @wraps(func)
+    def wrapper(self, prompt, system_prompt=None):
+        cache = _cache_for(self)
+        if cache is None:
+            return func(self, prompt, system_prompt)
+        key = response_key(self.name, self.config.language_model, system_prompt, prompt)
+        hit = cache.get(key)
+        if hit is not None:
+            return hit
+        result = func(self, prompt, system_prompt)
+        cache.set(key, result)
+        return result
+
+    return wrapper
+
+
+#: Entries held by the in-process vision memo (per provider instance).
+_VISION_MEMO_ENTRIES = 64
+
+
+def _vision_memo_for(provider) -> Optional[OrderedDict]:
+    """Bounded in-memory memo, on when ``extra["cache_responses"]`` is set.
+
+    OCR runs at temperature 0.1, so re-asking about the same page bytes
+    (retries after parse failures, multi-prompt probing) is a wasted
+    round-trip; a small LRU in front of the disk layer answers those
+    without any I/O. Creative chat stays uncached.
+    """
+    if not provider.config.extra.get("cache_responses"):
+        return None
+    memo = getattr(provider, "_vision_memo", None)
+    if memo is None:
+        memo = provider._vision_memo = OrderedDict()
+    return memo
+
+
+def cached_vision(func):
+    """Memoize a provider ``vision`` method, keyed on the image bytes too."""
+
+    @wraps(func)
+    def wrapper(self, image_data, prompt, image_format="png"):
+        cache = _cache_for(self)
+        memo = _vision_memo_for(self)
+        if cache is None and memo is None:
+            return func(self, image_data, prompt, image_format)
+        key = response_key(
+            self.name, self.config.vision_model, None, prompt, image_data=image_data
+        )
+        if memo is not None:
+            hit = memo.get(key)
+            if hit is not None:
+                memo.move_to_end(key)
+                return hit
+        if cache is not None:
+            hit = cache.get(key)
+            if hit is not None:
+                return hit
+        result = func(self, image_data, prompt, image_format)
+        if memo is not None:
+            memo[key] = result
+            if len(memo) > _VISION_MEMO_ENTRIES:
+                memo.popitem(last=False)
+        if cache is not None:
+            cache.set(key, result)
+        return result
+
+    return wrapper
@@ -0,0 +1,330 @@
+"""Provider selection and configuration.
+
+``get_provider`` reads settings from the environment (optionally seeded
+from a ``.env`` file) and returns a ready-to-use ``AIProvider``.
+"""
+
+import importlib
+import os
+import re
+import sys
+from collections import ChainMap
+from functools import lru_cache
+from typing import Dict, NamedTuple, Optional, Tuple, Type
+
+from providers.base import AIProvider, ProviderConfig
+
+# python-dotenv handles multi-line values and escape sequences that the
+# regex fallback below does not attempt; use it when installed.
+try:
+    from dotenv import dotenv_values
+except ImportError:  # pragma: no cover - optional dependency
+    dotenv_values = None
+
+#: name -> (module, provider class, factory function). Modules are only
+#: imported once a provider is actually requested: a run that uses one
+#: backend should not pay import time (and RSS) for the other four.
+PROVIDER_MODULES = {
+    "qwen": ("providers.qwen_provider", "QwenProvider", "create_qwen_provider"),
+    "openai": ("providers.openai_provider", "OpenAIProvider", "create_openai_provider"),
+    "anthropic": (
+        "providers.anthropic_provider",
+        "AnthropicProvider",
+        "create_anthropic_provider",
+    ),
+    "gemini": ("providers.gemini_provider", "GeminiProvider", "create_gemini_provider"),
+    "ollama": ("providers.ollama_provider", "OllamaProvider", "create_ollama_provider"),
+}
+
+
+#: Canonical names interned so the common lookup compares by pointer.
+_PROVIDER_NAMES = frozenset(sys.intern(n) for n in PROVIDER_MODULES)
+
+
+@lru_cache(maxsize=None)
+def _resolve_provider(name: str) -> Tuple[Type[AIProvider], callable]:
+    """Import the named provider's module and return (class, factory)."""
+    module_path, class_name, factory_name = PROVIDER_MODULES[name]
+    module = importlib.import_module(module_path)
+    return getattr(module, class_name), getattr(module, factory_name)
+
+class ProviderMeta(NamedTuple):
+    """Flat per-provider defaults and env-key names, resolved in one lookup.
+
+    The env-key strings are formatted once at import instead of building
+    ``f"{prefix}_VISION_MODEL"`` and friends on every ``get_provider``.
+    """
+
+    default_vision: str
+    default_language: str
+    api_key_env: Optional[str]
+    vision_env: str
+    language_env: str
+    base_url_env: str
+
+
+_PROVIDER_META: Dict[str, ProviderMeta] = {
+    name: ProviderMeta(
+        default_vision=vision,
+        default_language=language,
+        api_key_env=api_key_env,
+        vision_env=f"{name.upper()}_VISION_MODEL",
+        language_env=f"{name.upper()}_LANGUAGE_MODEL",
+        base_url_env=f"{name.upper()}_BASE_URL",
+    )
+    for name, vision, language, api_key_env in (
+        ("qwen", "qwen-vl-max", "qwen-max", "DASHSCOPE_API_KEY"),
+        ("openai", "gpt-4o", "gpt-4o", "OPENAI_API_KEY"),
+        (
+            "anthropic",
+            "claude-3-5-sonnet-20241022",
+            "claude-3-5-sonnet-20241022",
+            "ANTHROPIC_API_KEY",
+        ),
+        ("gemini", "gemini-1.5-pro", "gemini-1.5-pro", "GOOGLE_API_KEY"),
+        ("ollama", "llava", "qwen2.5", None),
+    )
+}
+
+
+#: Fallback locations probed for a ``.env``: the working directory and
+#: the repository root. Built once; an explicit path is checked first.
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+_ENV_SEARCH_PATHS: Tuple[str, ...] = (
+    ".env",
+    os.path.join(_PACKAGE_DIR, "..", ".env"),
+    os.path.join(_PACKAGE_DIR, "..", "..", ".env"),
+)
+
+
+def _resolve_env_path(env_path: Optional[str] = None) -> Optional[str]:
+    """First existing ``.env`` path (absolute), or None."""
+    candidates = (env_path, *_ENV_SEARCH_PATHS) if env_path else _ENV_SEARCH_PATHS
+    for candidate in candidates:
+        if os.path.exists(candidate):
+            return os.path.abspath(candidate)
+    return None
+
+
+#: One ``KEY=value`` line: quoted (double or single) or bare value,
+#: tolerating surrounding whitespace and trailing comments. A single
+#: compiled-regex sweep over the whole file replaces the per-line
+#: strip/startswith/split/strip-quotes sequence in the interpreter.
+_ENV_LINE_RE = re.compile(
+    r"^[ \t]*([A-Za-z_][A-Za-z0-9_]*)[ \t]*=[ \t]*"
+    r"(?:\"([^\"]*)\"|'([^']*)'|([^#\n]*?))[ \t]*(?:#.*)?$",
+    re.M,
+)
+
+
+@lru_cache(maxsize=16)
+def _parse_env_file(abs_path: str, mtime_ns: int, size: int) -> Dict[str, str]:
+    """Parse ``abs_path`` once per content fingerprint.
+
+    Provider instantiation is per-request in batch runs, and re-reading
+    an unchanging file each time was pure overhead. Keying on
+    ``(mtime_ns, size)`` means edits to the ``.env`` of a long-running
+    process invalidate transparently while unchanged files stay a dict
+    lookup. Callers get the cached dict — treat it as read-only.
+    """
+    if dotenv_values is not None:
+        return {k: v for k, v in dotenv_values(abs_path).items() if v is not None}
+    with open(abs_path, "r", encoding="utf-8") as f:
+        text = f.read()
+    env_vars: Dict[str, str] = {}
+    for m in _ENV_LINE_RE.finditer(text):
+        dq, sq, bare = m.group(2), m.group(3), m.group(4)
+        env_vars[m.group(1)] = dq if dq is not None else sq if sq is not None else bare
+    return env_vars
+
+
+def _load_env_file(env_path: Optional[str] = None) -> Dict[str, str]:
+    """Parse a ``.env`` file into a dict and seed ``os.environ``.
+
+    Searches the explicit path, the working directory and the repository
+    root; missing files are fine and yield an empty dict.
+    """
+    env_file = _resolve_env_path(env_path)
+    if env_file is None:
+        return {}
+    try:
+        st = os.stat(env_file)
+    except OSError:
+        return {}
+    env_vars = _parse_env_file(env_file, st.st_mtime_ns, st.st_size)
+    # Seeding environ stays outside the cached parse so a warm cache
+    # still populates a fresh environment. One batched update instead of
+    # per-key setdefault: each _Environ write is a putenv at the C level,
+    # so only genuinely new keys are touched.
+    new = {k: v for k, v in env_vars.items() if k not in os.environ}
+    if new:
+        os.environ.update(new)
+    return env_vars
+
+
+def _get_merged_env(env_file: Optional[str] = None) -> ChainMap:
+    """Layered environ-over-.env view shared by every factory entry point.
+
+    The parse underneath is memoized per content fingerprint, so repeat
+    calls cost one ``os.stat`` plus a ChainMap allocation. The view
+    itself is deliberately not cached: freezing it would defeat the
+    mtime invalidation and hide live ``os.environ`` changes.
+    """
+    return ChainMap(os.environ, _load_env_file(env_file))
+
+
+@lru_cache(maxsize=1)
+def get_default_provider() -> str:
+    """Name of the provider to use when the caller does not pick one.
+
+    Cached for the life of the process: CLIs commonly call this and
+    then ``get_provider`` back to back, and the answer only changes if
+    the environment does — use ``_invalidate_caches`` in that case.
+    """
+    return _get_merged_env().get("AI_PROVIDER", "qwen")
+
+
+def _invalidate_caches() -> None:
+    """Reset factory-level caches after hot-swapping ``.env`` or environ.
+
+    Meant for tests and long-running daemons; normal runs never need it.
+    """
+    get_default_provider.cache_clear()
+    _parse_env_file.cache_clear()
+    _build_provider.cache_clear()
+
+
+def get_provider(
+    provider_name: Optional[str] = None,
+    env_file: Optional[str] = None,
+    **kwargs,
+) -> AIProvider:
+    """Build the named provider from environment configuration.
+
+    Per-provider settings come from ``<PROVIDER>_VISION_MODEL`` and
+    ``<PROVIDER>_LANGUAGE_MODEL``; generic tuning from ``AI_MAX_TOKENS``,
+    ``AI_TEMPERATURE``, ``AI_MAX_RETRIES`` and ``AI_RETRY_DELAY``.
+    Keyword arguments override everything: any ``ProviderConfig`` field
+    name (``rpm``, ``top_p``, ``max_concurrency``, ...) sets that field,
+    and unrecognized keys land in ``config.extra``.
+    """
+    cfg = _get_merged_env(env_file)
+    if provider_name is None:
+        provider_name = get_default_provider()
+    # Callers almost always pass the canonical lower-case name; only
+    # normalize (allocating a new str) when that first check misses.
+    if provider_name not in _PROVIDER_NAMES:
+        provider_name = provider_name.lower()
+        if provider_name not in _PROVIDER_NAMES:
+            raise ValueError(
+                f"Unknown provider '{provider_name}'. "
+                f"Available: {', '.join(sorted(_PROVIDER_NAMES))}"
+            )
+
+    meta = _PROVIDER_META[provider_name]
+
+    api_key = kwargs.pop("api_key", None)
+    if api_key is None and meta.api_key_env is not None:
+        api_key = cfg.get(meta.api_key_env)
+
+    # Settings resolve through one table-driven pass (kwarg, then env
+    # chain, then default, with a converter for the numeric ones)
+    # instead of five copy-pasted conditionals.
+    vision_model, language_model, base_url = (
+        kwargs.pop(name, cfg.get(env_key, default))
+        for name, env_key, default in (
+            ("vision_model", meta.vision_env, meta.default_vision),
+            ("language_model", meta.language_env, meta.default_language),
+            ("base_url", meta.base_url_env, None),
+        )
+    )
+    max_tokens, temperature, max_retries, retry_delay = (
+        convert(kwargs.pop(name, cfg.get(env_key, default)))
+        for name, env_key, default, convert in (
+            ("max_tokens", "AI_MAX_TOKENS", 4096, int),
+            ("temperature", "AI_TEMPERATURE", 0.3, float),
+            ("max_retries", "AI_MAX_RETRIES", 3, int),
+            ("retry_delay", "AI_RETRY_DELAY", 1.0, float),
+        )
+    )
+
+    if not kwargs:
+        # Same effective config -> same instance, so the underlying SDK
+        # client (and its connection pool) is reused across calls that
+        # would otherwise rebuild it per page.
+        return _build_provider(
+            provider_name,
+            api_key,
+            vision_model,
+            language_model,
+            max_tokens,
+            temperature,
+            max_retries,
+            retry_delay,
+            base_url,
+        )
+    # Leftover kwargs go through from_raw's sweep: ProviderConfig field
+    # names (rpm, top_p, max_concurrency, ...) set the real fields —
+    # stuffing them all into extra would leave e.g. the rate limiter
+    # reading the default rpm — and only unknown keys end up in extra.
+    config = ProviderConfig.from_raw(
+        api_key=api_key,
+        vision_model=vision_model,
+        language_model=language_model,
+        max_tokens=max_tokens,
+        temperature=temperature,
+        max_retries=max_retries,
+        retry_delay=retry_delay,
+        base_url=base_url,
+        **kwargs,
+    )
+    return _resolve_provider(provider_name)[0](config)
+
+
+@lru_cache(maxsize=8)
+def _build_provider(
+    provider_name: str,
+    api_key: Optional[str],
+    vision_model: str,
+    language_model: str,
+    max_tokens: int,
+    temperature: float,
+    max_retries: int,
+    retry_delay: float,
+    base_url: Optional[str],
+) -> AIProvider:
+    """Instance cache keyed on the effective (hashable) config values.
+
+    Calls carrying extra keyword settings bypass this — a dict in
+    ``extra`` is not hashable and such configs are rare anyway.
+    """
+    config = ProviderConfig.from_raw(
+        api_key=api_key,
+        vision_model=vision_model,
+        language_model=language_model,
+        max_tokens=max_tokens,
+        temperature=temperature,
+        max_retries=max_retries,
+        retry_delay=retry_delay,
+        base_url=base_url,
+    )
+    return _resolve_provider(provider_name)[0](config)
+
+
+def list_providers() -> list:
+    """Names of all registered providers (no imports triggered)."""
+    return list(PROVIDER_MODULES)
+
+
+def get_provider_info(provider_name: str) -> Dict[str, str]:
+    """Human-readable summary of a provider's defaults."""
+    provider_name = provider_name.lower()
+    if provider_name not in PROVIDER_MODULES:
+        raise ValueError(f"Unknown provider '{provider_name}'")
+    meta = _PROVIDER_META[provider_name]
+    return {
+        "name": provider_name,
+        "class": PROVIDER_MODULES[provider_name][1],
+        "default_vision_model": meta.default_vision,
+        "default_language_model": meta.default_language,
+    }
@@ -0,0 +1,73 @@
+"""Google Gemini provider."""
+
+from functools import cached_property
+from typing import Optional
+
+from providers.base import AIProvider, ProviderConfig
+from providers.cache import cached_chat, cached_vision
+
+
+class GeminiProvider(AIProvider):
+    """Gemini chat and vision via ``google-generativeai``."""
+
+    name = "gemini"
+
+    # Generation settings derive from the frozen config, so they are
+    # built once per instance instead of allocating a dict per call.
+    @cached_property
+    def _chat_generation_config(self) -> dict:
+        return {
+            "temperature": self.config.temperature,
+            "top_p": self.config.top_p,
+            "max_output_tokens": self.config.max_tokens,
+        }
+
+    @cached_property
+    def _vision_generation_config(self) -> dict:
+        return {
+            "temperature": 0.1,
+            "max_output_tokens": self.config.max_tokens,
+        }
+
+    def _initialize_client(self) -> None:
+        import google.generativeai as genai
+
+        genai.configure(api_key=self.config.api_key)
+        self._client = genai
+
+    @cached_chat
+    def chat(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+        model = self.client.GenerativeModel(
+            self.config.language_model,
+            system_instruction=system_prompt or None,
+        )
+        generation_config = self._chat_generation_config
+
+        def _call():
+            response = model.generate_content(prompt, generation_config=generation_config)
+            return response.text
+
+        return self._retry_with_backoff(_call)
+
+    @cached_vision
+    def vision(self, image_data: bytes, prompt: str, image_format: str = "png") -> str:
+        model = self.client.GenerativeModel(self.config.vision_model)
+        generation_config = self._vision_generation_config
+        blob = {"mime_type": f"image/{image_format}", "data": image_data}
+
+        def _call():
+            response = model.generate_content([prompt, blob], generation_config=generation_config)
+            return response.text
+
+        return self._retry_with_backoff(_call)
+
+
+def create_gemini_provider(api_key: Optional[str] = None, **kwargs) -> GeminiProvider:
+    """Build a ``GeminiProvider`` with sensible model defaults."""
+    config = ProviderConfig.from_raw(
+        api_key=api_key,
+        vision_model=kwargs.pop("vision_model", "gemini-1.5-pro"),
+        language_model=kwargs.pop("language_model", "gemini-1.5-pro"),
+        **kwargs,
+    )
+    return GeminiProvider(config)
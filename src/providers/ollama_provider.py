@@ -0,0 +1,196 @@
+"""Local Ollama provider."""
+
+import base64
+import json
+import urllib.error
+import urllib.request
+from functools import cached_property
+from typing import Iterable, List, Optional
+
+from providers.base import AIProvider, ProviderConfig
+from providers.cache import cached_chat, cached_vision
+
+# A pooled session keeps the loopback TCP connection open across calls;
+# without it every request pays socket setup, which dominates short
+# prompts. urllib remains the zero-dependency fallback.
+try:
+    import requests
+except ImportError:  # pragma: no cover - optional dependency
+    requests = None
+
+# orjson parses the NDJSON chunks straight from bytes — no per-line
+# UTF-8 decode — and is several times faster than stdlib json.
+try:
+    import orjson
+
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:  # pragma: no cover - optional dependency
+    _loads = json.loads
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+DEFAULT_OLLAMA_URL = "http://localhost:11434"
+
+#: Model-name fragments that indicate vision support.
+_VISION_MODEL_TAGS = ("llava", "bakllava", "moondream", "minicpm-v")
+
+
+class OllamaProvider(AIProvider):
+    """Chat and vision against a local Ollama server."""
+
+    name = "ollama"
+
+    def __init__(self, config: ProviderConfig):
+        super().__init__(config)
+        self._session = None
+        # Serialized payload prefixes keyed by (model, temperature): the
+        # constant keys (model, stream, options) are encoded once per
+        # provider lifetime and only the prompt/image is spliced per call.
+        self._payload_templates: dict = {}
+
+    def _payload_template(self, model: str, temperature: float) -> bytes:
+        key = (model, temperature)
+        template = self._payload_templates.get(key)
+        if template is None:
+            # Drop the closing brace so callers can splice extra fields.
+            template = _dumps(
+                {
+                    "model": model,
+                    "stream": True,
+                    "options": {
+                        "temperature": temperature,
+                        "num_predict": self.config.max_tokens,
+                    },
+                }
+            )[:-1]
+            self._payload_templates[key] = template
+        return template
+
+    def _initialize_client(self) -> None:
+        self._base_url = (self.config.base_url or DEFAULT_OLLAMA_URL).rstrip("/")
+        # No SDK; the "client" is just the validated base URL.
+        self._client = self._base_url
+        self._session = requests.Session() if requests is not None else None
+
+    def close(self) -> None:
+        """Release the pooled connection, if one was opened."""
+        if getattr(self, "_session", None) is not None:
+            self._session.close()
+            self._session = None
+
+    def __del__(self):
+        self.close()
+
+    @cached_property
+    def supports_vision(self) -> bool:
+        # Config is frozen, so the substring scan (and its .lower()
+        # allocation) runs once per instance, not per poll.
+        return any(m in self.config.vision_model.lower() for m in _VISION_MODEL_TAGS)
+
+    @staticmethod
+    def _read_stream(lines: Iterable[bytes]) -> str:
+        # Accumulate in a list and join once: += on str re-copies the
+        # whole prefix per chunk, going quadratic on long generations.
+        parts: List[str] = []
+        for line in lines:
+            if not line.strip():
+                continue
+            chunk = _loads(line)
+            if "response" in chunk:
+                parts.append(chunk["response"])
+            elif "message" in chunk:
+                parts.append(chunk["message"].get("content", ""))
+            if chunk.get("done"):
+                break
+        return "".join(parts)
+
+    def _make_request(self, endpoint: str, body: bytes) -> str:
+        url = f"{self.client}{endpoint}"
+        headers = {"Content-Type": "application/json"}
+        if self._session is not None:
+            with self._session.post(
+                url, data=body, headers=headers, stream=True, timeout=300
+            ) as response:
+                response.raise_for_status()
+                return self._read_stream(response.iter_lines())
+        request = urllib.request.Request(url, data=body, headers=headers)
+        with urllib.request.urlopen(request, timeout=300) as response:
+            return self._read_stream(response)
+
+    @cached_chat
+    def chat(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+        body = (
+            self._payload_template(self.config.language_model, self.config.temperature)
+            + b',"prompt":'
+            + _dumps(prompt)
+        )
+        if system_prompt:
+            body += b',"system":' + _dumps(system_prompt)
+        body += b"}"
+
+        def _call():
+            return self._make_request("/api/generate", body)
+
+        return self._retry_with_backoff(_call)
+
+    @cached_vision
+    def vision(self, image_data: bytes, prompt: str, image_format: str = "png") -> str:
+        # The Ollama API only takes base64-in-JSON, but the encoded image
+        # never needs to exist as str: b64encode's bytes output is
+        # JSON-safe, so it is quoted and spliced into the body directly,
+        # skipping a multi-MB ascii decode plus re-encode per call.
+        if isinstance(image_data, (bytearray, memoryview)):
+            image_data = bytes(image_data)
+        body = (
+            self._payload_template(self.config.vision_model, 0.1)
+            + b',"prompt":'
+            + _dumps(prompt)
+            + b',"images":["'
+            + base64.b64encode(image_data)
+            + b'"]}'
+        )
+
+        def _call():
+            return self._make_request("/api/generate", body)
+
+        return self._retry_with_backoff(_call)
+
+    def list_models(self) -> List[str]:
+        """Names of the models installed on the local server."""
+        url = f"{self.client}/api/tags"
+        if self._session is not None:
+            response = self._session.get(url, timeout=5)
+            response.raise_for_status()
+            data = response.json()
+        else:
+            request = urllib.request.Request(url)
+            with urllib.request.urlopen(request, timeout=5) as response:
+                data = _loads(response.read())
+        return [m["name"] for m in data.get("models", [])]
+
+    def pull_model(self, model_name: str) -> bool:
+        """Ask the server to pull ``model_name``; returns True on success."""
+        try:
+            self._make_request("/api/pull", _dumps({"name": model_name, "stream": False}))
+            return True
+        except (urllib.error.URLError, OSError):
+            return False
+
+    def validate_connection(self) -> bool:
+        try:
+            self.list_models()
+            return True
+        except Exception:
+            return False
+
+
+def create_ollama_provider(**kwargs) -> OllamaProvider:
+    """Build an ``OllamaProvider``; no API key needed for local use."""
+    config = ProviderConfig.from_raw(
+        vision_model=kwargs.pop("vision_model", "llava"),
+        language_model=kwargs.pop("language_model", "qwen2.5"),
+        **kwargs,
+    )
+    return OllamaProvider(config)
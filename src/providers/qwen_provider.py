@@ -0,0 +1,88 @@
+"""Qwen (DashScope) provider, via the OpenAI-compatible endpoint."""
+
+from functools import cached_property
+from typing import Optional
+
+from providers.base import AIProvider, ProviderConfig, encode_image_base64
+from providers.cache import cached_chat, cached_vision
+
+DASHSCOPE_BASE_URL = "https://dashscope.aliyuncs.com/compatible-mode/v1"
+
+#: Model-name fragments that indicate vision support.
+_VISION_MODEL_TAGS = ("qwen-vl", "qvq")
+
+
+class QwenProvider(AIProvider):
+    """Qwen chat and vision through DashScope's OpenAI-compatible API."""
+
+    name = "qwen"
+
+    def _initialize_client(self) -> None:
+        import openai
+
+        self._client = openai.OpenAI(
+            api_key=self.config.api_key,
+            base_url=self.config.base_url or DASHSCOPE_BASE_URL,
+        )
+
+    @cached_property
+    def supports_vision(self) -> bool:
+        # Config is frozen, so the substring scan runs once per instance.
+        return any(m in self.config.vision_model.lower() for m in _VISION_MODEL_TAGS)
+
+    @cached_chat
+    def chat(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+
+        def _call():
+            response = self.client.chat.completions.create(
+                model=self.config.language_model,
+                messages=messages,
+                max_tokens=self.config.max_tokens,
+                temperature=self.config.temperature,
+            )
+            return response.choices[0].message.content
+
+        return self._retry_with_backoff(_call)
+
+    @cached_vision
+    def vision(self, image_data: bytes, prompt: str, image_format: str = "png") -> str:
+        # Data URL and messages are built once: retries re-enter _call,
+        # and re-concatenating a multi-MB base64 string per attempt is
+        # avoidable allocation.
+        image_base64 = encode_image_base64(image_data)
+        data_url = f"data:image/{image_format};base64,{image_base64}"
+        messages = [
+            {
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": prompt},
+                    {"type": "image_url", "image_url": {"url": data_url}},
+                ],
+            }
+        ]
+
+        def _call():
+            response = self.client.chat.completions.create(
+                model=self.config.vision_model,
+                messages=messages,
+                max_tokens=self.config.max_tokens,
+                temperature=0.1,
+            )
+            return response.choices[0].message.content
+
+        return self._retry_with_backoff(_call)
+
+
+def create_qwen_provider(api_key: Optional[str] = None, **kwargs) -> QwenProvider:
+    """Build a ``QwenProvider`` with sensible model defaults."""
+    config = ProviderConfig.from_raw(
+        api_key=api_key,
+        vision_model=kwargs.pop("vision_model", "qwen-vl-max"),
+        language_model=kwargs.pop("language_model", "qwen-max"),
+        **kwargs,
+    )
+    return QwenProvider(config)
@@ -0,0 +1,387 @@
+"""Small shared helpers for the book pipeline."""
+
+import os
+import re
+import sys
+import threading
+from collections import Counter
+from functools import lru_cache
+from typing import List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+#: Below this length the utf-32 encode for the NumPy path costs more
+#: than the pure-Python loop it replaces.
+_NUMPY_MIN_CHARS = 4096
+
+# Compiled once: these helpers run per page/section, and literal-pattern
+# re.sub/re.findall re-enter the re module's cache lookup on every call.
+# One class, one scan: any run of invalid characters, whitespace or
+# underscores becomes a single "_". Invalid characters used to be
+# dropped outright; turning them into the same separator keeps word
+# boundaries visible ("a/b" -> "a_b", not "ab") and halves the passes.
+_SANITIZE_RE = re.compile(r'[\s<>:"/\\|?*_]+')
+
+
+def sanitize_filename(name: str, max_length: int = 80) -> str:
+    """Turn an arbitrary title into a safe filename."""
+    return _SANITIZE_RE.sub("_", name).strip("._")[:max_length]
+
+
+#: Delete-table argument for counting Latin letters: removing A-Za-z
+#: from the UTF-8 encoding and diffing lengths counts them entirely in
+#: C. Continuation bytes of multi-byte sequences are all >= 0x80, so
+#: they can never collide with the ASCII letter range.
+_LATIN_BYTES = bytes(range(0x41, 0x5B)) + bytes(range(0x61, 0x7B))
+
+#: str-level twin of the delete table, for text that is not ASCII:
+#: deleting straight from the str skips the UTF-8 encode, which would
+#: triple the buffer on CJK-heavy input just to count its few letters.
+_DEL_LATIN = str.maketrans("", "", _LATIN_BYTES.decode("ascii"))
+
+
+def _count_latin(data: bytes) -> int:
+    return len(data) - len(data.translate(None, _LATIN_BYTES))
+
+
+# One combined pattern with named groups counts all three non-ASCII
+# scripts in a single C-level traversal; ``lastgroup`` says which
+# alternative matched. Latin is not a group here — the delete-table
+# count covers it without per-match overhead.
+_SCRIPTS_RE = re.compile(
+    r"(?P<zh>[\u4e00-\u9fff])|(?P<el>[\u0370-\u03ff\u1f00-\u1fff])|(?P<he>[\u0590-\u05ff])"
+)
+
+
+def _count_scripts(text: str) -> tuple:
+    """Counts of (Chinese, Greek, Hebrew) codepoints in one regex pass."""
+    c = Counter(m.lastgroup for m in _SCRIPTS_RE.finditer(text))
+    return c["zh"], c["el"], c["he"]
+
+
+def _count_scripts_numpy(text: str) -> tuple:
+    """Vectorized script counting over the raw codepoint array.
+
+    The interpreter loop is the bottleneck on long texts; mask
+    reductions over a uint32 view push the work into C at memory
+    bandwidth.
+    """
+    arr = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+    zh = int(((arr >= 0x4E00) & (arr <= 0x9FFF)).sum())
+    el = int((((arr >= 0x0370) & (arr <= 0x03FF)) | ((arr >= 0x1F00) & (arr <= 0x1FFF))).sum())
+    he = int(((arr >= 0x0590) & (arr <= 0x05FF)).sum())
+    en = int((((arr >= 0x41) & (arr <= 0x5A)) | ((arr >= 0x61) & (arr <= 0x7A))).sum())
+    return zh, el, he, en
+
+
+def detect_language(text: str) -> str:
+    """Best-effort script detection: ``zh``, ``el``, ``he``, ``en`` or ``unknown``.
+
+    One walk over the text with ordinal range checks replaces four
+    regex scans, which each allocated a full match list just to be
+    counted — on book-sized inputs that was four reads of the text and
+    four throwaway lists. Counting proceeds in chunks, and any script
+    that passes half the total length has already won, so uniform text
+    returns after the first chunks. Texts long enough to amortize the
+    utf-32 encode go through NumPy when it is available.
+    """
+    # Plain English is by far the most common input, and str.isascii is
+    # a cheap C scan: when it holds, the only possible answer is "en"
+    # (any Latin letter present) or "unknown", with no Unicode ranges
+    # to tally at all.
+    if text.isascii():
+        return "en" if _count_latin(text.encode("ascii")) else "unknown"
+    if np is not None and len(text) >= _NUMPY_MIN_CHARS:
+        zh, el, he, en = _count_scripts_numpy(text)
+    else:
+        threshold = len(text) // 2
+        # Latin is counted first over the whole text — translate with a
+        # delete table runs in C, and English is the dominant input. If
+        # it already holds the majority, the per-character loop never
+        # runs at all.
+        en = len(text) - len(text.translate(_DEL_LATIN))
+        zh = el = he = 0
+        if en <= threshold:
+            for start in range(0, len(text), 1024):
+                czh, cel, che = _count_scripts(text[start : start + 1024])
+                zh += czh
+                el += cel
+                he += che
+                if max(zh, el, he) > threshold:
+                    break
+    counts = {"zh": zh, "el": el, "he": he, "en": en}
+    best = max(counts, key=counts.get)
+    if counts[best] == 0:
+        return "unknown"
+    return best
+
+
+# Roman digit values indexed by byte, upper and lower case both set so
+# parsing needs no .upper() copy; every other byte maps to 0.
+_ROMAN_LUT = [0] * 256
+for _ch, _val in (("I", 1), ("V", 5), ("X", 10), ("L", 50), ("C", 100), ("D", 500), ("M", 1000)):
+    _ROMAN_LUT[ord(_ch)] = _ROMAN_LUT[ord(_ch.lower())] = _val
+_ROMAN_LUT = tuple(_ROMAN_LUT)
+del _ch, _val
+
+
+def roman_to_int(roman: str) -> int:
+    """Parse a Roman numeral; unknown characters count as zero."""
+    # Forward scan over the encoded bytes: a digit smaller than its
+    # successor is subtractive. Indexing the tuple by byte replaces a
+    # hash lookup per character, encoding with errors="ignore" drops
+    # non-ASCII up front, and no reversed iterator is allocated.
+    data = roman.encode("ascii", "ignore")
+    n = len(data)
+    total = 0
+    for i in range(n):
+        value = _ROMAN_LUT[data[i]]
+        if i + 1 < n and value < _ROMAN_LUT[data[i + 1]]:
+            total -= value
+        else:
+            total += value
+    return total
+
+
+# Each decimal digit maps to a fixed numeral fragment, so formatting is
+# three table lookups and a join — no value scanning or subtraction.
+_ROMAN_HUNDREDS = ("", "C", "CC", "CCC", "CD", "D", "DC", "DCC", "DCCC", "CM")
+_ROMAN_TENS = ("", "X", "XX", "XXX", "XL", "L", "LX", "LXX", "LXXX", "XC")
+_ROMAN_UNITS = ("", "I", "II", "III", "IV", "V", "VI", "VII", "VIII", "IX")
+
+
+def roman_to_int_many(romans: List[str]) -> List[int]:
+    """Parse a batch of Roman numerals, vectorized when NumPy is present.
+
+    Bulk workloads (OCR'd front-matter page numbers) parse thousands of
+    short numerals; one LUT gather plus a signed sum per numeral beats
+    the per-character interpreter loop. Falls back to ``roman_to_int``
+    per item without NumPy.
+    """
+    if np is None:
+        return [roman_to_int(r) for r in romans]
+    lut = _roman_lut_np()
+    results = []
+    for roman in romans:
+        vals = lut[np.frombuffer(roman.encode("ascii", "ignore"), dtype=np.uint8)]
+        if len(vals) < 2:
+            results.append(int(vals.sum()))
+            continue
+        # A digit smaller than its successor is subtractive (IV, XC...).
+        total = int(np.where(vals[:-1] < vals[1:], -vals[:-1], vals[:-1]).sum()) + int(vals[-1])
+        results.append(total)
+    return results
+
+
+@lru_cache(maxsize=1)
+def _roman_lut_np():
+    return np.array(_ROMAN_LUT, dtype=np.int16)
+
+
+@lru_cache(maxsize=4096)
+def int_to_roman(num: int) -> str:
+    """Format 1..3999 as a Roman numeral.
+
+    Page-numbering loops ask for the same small values over and over;
+    the cache covers the whole practical domain, so each numeral is
+    assembled once per process.
+    """
+    if num <= 0:
+        return ""
+    thousands, rest = divmod(num, 1000)
+    return (
+        "M" * thousands
+        + _ROMAN_HUNDREDS[rest // 100]
+        + _ROMAN_TENS[rest // 10 % 10]
+        + _ROMAN_UNITS[rest % 10]
+    )
+
+
+def _build_chinese_numerals() -> tuple:
+    digits = "零一二三四五六七八九"
+    table = list(digits)
+    table.append("十")
+    table.extend("十" + digits[u] for u in range(1, 10))
+    for n in range(20, 100):
+        tens, units = divmod(n, 10)
+        table.append(digits[tens] + "十" + (digits[units] if units else ""))
+    return tuple(table)
+
+
+#: Chapter numbers 0..99 rendered once at import; lookups are free.
+_CN_TABLE = _build_chinese_numerals()
+
+
+def chinese_numeral(num: int) -> str:
+    """Format a chapter number in Chinese (1..99; larger falls back to digits)."""
+    if 0 <= num < 100:
+        return _CN_TABLE[num]
+    return str(num)
+
+
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB", "PB")
+
+
+def format_file_size(size_bytes: int) -> str:
+    """Human-readable file size, e.g. ``3.4 MB``."""
+    # bit_length picks the unit directly (each unit spans 10 bits), so
+    # one shift and one divide replace the compare-and-divide loop.
+    i = min(len(_SIZE_UNITS) - 1, max(0, (size_bytes.bit_length() - 1) // 10))
+    return f"{size_bytes / (1 << (10 * i)):.1f} {_SIZE_UNITS[i]}"
+
+
+# Bar segments are sliced from these rather than rebuilt with ``*`` on
+# every tick; 200 covers any sane terminal width.
+_BAR_FULL = "█" * 200
+_BAR_EMPTY = "░" * 200
+
+
+def progress_bar(current: int, total: int, width: int = 40, prefix: str = "") -> None:
+    """Render an in-place progress bar on stdout.
+
+    Redraws only when the visible output would change, so calling this
+    once per item in a tight loop costs a few comparisons, not a write
+    and flush per iteration.
+    """
+    if total <= 0:
+        return
+    # Pure integer division: exact (no float rounding at the 100% edge)
+    # and cheaper than two FP divides per tick.
+    percent = current * 100 // total
+    filled = current * width // total
+    if filled > width:
+        filled = width
+    if progress_bar._last == (filled, percent, width) and current < total:
+        return
+    progress_bar._last = (filled, percent, width)
+    bar = _BAR_FULL[:filled] + _BAR_EMPTY[: width - filled]
+    line = f"\r{prefix}|{bar}| {percent:.0f}%"
+    if current >= total:
+        line += "\n"
+        progress_bar._last = None
+    sys.stdout.write(line)
+    sys.stdout.flush()
+
+
+progress_bar._last = None
+
+
+# Asynchronous progress API: for loops whose body is microseconds, even
+# the coalesced write in progress_bar serializes the worker with the
+# terminal. update_progress is a bare attribute assignment; a daemon
+# thread polls the latest value at 20 Hz and does all the rendering.
+_progress_state: Optional[tuple] = None
+_progress_rendered: Optional[tuple] = None
+_progress_stop: Optional[threading.Event] = None
+_progress_thread: Optional[threading.Thread] = None
+
+
+def _progress_render_loop(stop: "threading.Event") -> None:
+    # Dedup on the raw (current, total, ...) tuple rather than relying
+    # on progress_bar's own cache: that cache resets at 100% so the bar
+    # can be reused, which would make an idle poller reprint the
+    # finished line every wake.
+    global _progress_rendered
+    while not stop.wait(0.05):
+        state = _progress_state
+        if state is not None and state != _progress_rendered:
+            progress_bar(*state)
+            _progress_rendered = state
+
+
+def start_progress(total: int, width: int = 40, prefix: str = "") -> None:
+    """Start rendering progress from a background thread."""
+    global _progress_state, _progress_rendered, _progress_stop, _progress_thread
+    if _progress_thread is not None:
+        stop_progress()
+    _progress_state = (0, total, width, prefix)
+    _progress_rendered = None
+    _progress_stop = threading.Event()
+    _progress_thread = threading.Thread(
+        target=_progress_render_loop, args=(_progress_stop,), daemon=True
+    )
+    _progress_thread.start()
+
+
+def update_progress(current: int) -> None:
+    """Record the latest position; costs one tuple build, no I/O."""
+    global _progress_state
+    state = _progress_state
+    if state is not None:
+        _progress_state = (current,) + state[1:]
+
+
+def stop_progress() -> None:
+    """Stop the renderer and draw the final state if it was not yet shown."""
+    global _progress_state, _progress_rendered, _progress_stop, _progress_thread
+    if _progress_thread is None:
+        return
+    _progress_stop.set()
+    _progress_thread.join()
+    if _progress_state is not None and _progress_state != _progress_rendered:
+        progress_bar(*_progress_state)
+    _progress_state = _progress_rendered = None
+    _progress_stop = _progress_thread = None
+
+
+def _iter_paragraphs(text: str):
+    """Yield stripped, non-empty blank-line-separated spans one at a time.
+
+    ``text.split("\\n\\n")`` materializes every paragraph substring up
+    front — roughly 2x the text in memory before merging even starts.
+    Walking the separators with ``str.find`` keeps one paragraph live
+    at a time.
+    """
+    pos = 0
+    n = len(text)
+    while pos < n:
+        end = text.find("\n\n", pos)
+        if end == -1:
+            end = n
+        para = text[pos:end].strip()
+        if para:
+            yield para
+        pos = end + 2
+
+
+def split_into_paragraphs(text: str, max_length: int = 2000) -> List[str]:
+    """Split on blank lines, merging short runs up to ``max_length`` chars."""
+    result: List[str] = []
+    # Accumulate pieces and join on flush: += on the growing buffer
+    # re-copies the whole prefix per paragraph, which goes quadratic on
+    # documents made of many short paragraphs. buf_len tracks the joined
+    # length so the size check stays O(1).
+    buf_parts: List[str] = []
+    buf_len = 0
+    for para in _iter_paragraphs(text):
+        if not buf_parts:
+            buf_parts.append(para)
+            buf_len = len(para)
+        elif buf_len + len(para) + 1 <= max_length:
+            buf_parts.append(para)
+            buf_len += len(para) + 1
+        else:
+            result.append(" ".join(buf_parts))
+            buf_parts = [para]
+            buf_len = len(para)
+    if buf_parts:
+        result.append(" ".join(buf_parts))
+    return result
+
+
+#: Directories already created this process, keyed by normalized path.
+#: Pipelines write thousands of files into a handful of directories;
+#: without the cache every write pays a mkdir syscall just to get EEXIST.
+_ENSURED: set = set()
+
+
+def ensure_directory(path: str) -> str:
+    """Create ``path`` (and parents) if needed; returns it for chaining."""
+    key = os.path.normpath(path)
+    if key not in _ENSURED:
+        os.makedirs(path, exist_ok=True)
+        _ENSURED.add(key)
+    return path
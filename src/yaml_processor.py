@@ -0,0 +1,244 @@
+"""YAML book storage for the bilingual reader.
+
+Books live under ``books/`` as one YAML file each::
+
+    metadata:
+      title_en: ...
+      title_cn: ...
+      author: ...
+    chapters:
+      - number: 1
+        title_en: ...
+        title_cn: ...
+        sections:
+          - id: 1
+            en: ...
+            cn: ...
+            footnotes:
+              - marker: "*"
+                en: ...
+                cn: ...
+
+The dataclasses below mirror that structure; ``YAMLProcessor`` handles
+loading and saving whole books.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Sequence
+
+import yaml
+
+# Shared sentinel for sections without footnotes: most sections have none,
+# and one module-level tuple beats a fresh list per section.
+_EMPTY_FOOTNOTES: Sequence[Dict[str, str]] = ()
+
+
+class _BookDumper(yaml.SafeDumper):
+    """SafeDumper that emits mappings in insertion order.
+
+    to_dict() already builds dicts in the order we want on disk, so the
+    representer hands items() straight to represent_mapping and skips
+    PyYAML's per-mapping sorted-vs-unsorted bookkeeping.
+    """
+
+
+_BookDumper.add_representer(
+    dict,
+    lambda dumper, data: dumper.represent_mapping("tag:yaml.org,2002:map", data.items()),
+)
+
+
+@dataclass
+class Section:
+    """One aligned English/Chinese paragraph pair."""
+
+    id: int = 0
+    en: str = ""
+    cn: str = ""
+    footnotes: Sequence[Dict[str, str]] = ()
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Section":
+        fn = data.get("footnotes")
+        footnotes = fn if fn else _EMPTY_FOOTNOTES
+        # Well-formed book YAML always carries id/en/cn, so index directly
+        # and only fall back to per-key defaults on malformed input.
+        try:
+            return cls(
+                id=data["id"],
+                en=data["en"],
+                cn=data["cn"],
+                footnotes=footnotes,
+            )
+        except KeyError:
+            return cls(
+                id=data.get("id", 0),
+                en=data.get("en", ""),
+                cn=data.get("cn", ""),
+                footnotes=footnotes,
+            )
+
+    def to_dict(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {"id": self.id, "en": self.en, "cn": self.cn}
+        if self.footnotes:
+            data["footnotes"] = list(self.footnotes)
+        return data
+
+
+@dataclass
+class Chapter:
+    """A chapter: bilingual title plus its sections."""
+
+    number: int = 0
+    title_en: str = ""
+    title_cn: str = ""
+    sections: List[Section] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Chapter":
+        try:
+            return cls(
+                number=data["number"],
+                title_en=data["title_en"],
+                title_cn=data["title_cn"],
+                sections=[Section.from_dict(s) for s in data.get("sections", [])],
+            )
+        except KeyError:
+            return cls(
+                number=data.get("number", 0),
+                title_en=data.get("title_en", ""),
+                title_cn=data.get("title_cn", ""),
+                sections=[Section.from_dict(s) for s in data.get("sections", [])],
+            )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "number": self.number,
+            "title_en": self.title_en,
+            "title_cn": self.title_cn,
+            "sections": [s.to_dict() for s in self.sections],
+        }
+
+
+@dataclass
+class BookMetadata:
+    """Book front-matter."""
+
+    title_en: str = ""
+    title_cn: str = ""
+    author: str = ""
+    translator: str = ""
+    year: str = ""
+    description: str = ""
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BookMetadata":
+        try:
+            return cls(**data)
+        except TypeError:
+            known = {f for f in cls.__dataclass_fields__}
+            return cls(**{k: v for k, v in data.items() if k in known})
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "title_en": self.title_en,
+            "title_cn": self.title_cn,
+            "author": self.author,
+            "translator": self.translator,
+            "year": self.year,
+            "description": self.description,
+        }
+
+
+@dataclass
+class BookContent:
+    """A full book: metadata plus chapters."""
+
+    metadata: BookMetadata = field(default_factory=BookMetadata)
+    chapters: List[Chapter] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BookContent":
+        return cls(
+            metadata=BookMetadata.from_dict(data.get("metadata", {})),
+            chapters=[Chapter.from_dict(c) for c in data.get("chapters", [])],
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "metadata": self.metadata.to_dict(),
+            "chapters": [c.to_dict() for c in self.chapters],
+        }
+
+
+class YAMLProcessor:
+    """Load and save book YAML files."""
+
+    def __init__(self, books_dir: str = "books"):
+        self.books_dir = books_dir
+        # path -> ((mtime_ns, size), BookContent); lets pipeline stages
+        # that reread the same artifact skip the reparse.
+        self._book_cache: Dict[str, tuple] = {}
+
+    def load_book(self, yaml_path: str) -> BookContent:
+        """Parse one book file into a ``BookContent``.
+
+        Results are memoized per path and invalidated on mtime/size
+        change, so repeated loads of an unchanged file cost one stat.
+        """
+        st = os.stat(yaml_path)
+        fingerprint = (st.st_mtime_ns, st.st_size)
+        cached = self._book_cache.get(yaml_path)
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+        with open(yaml_path, "r", encoding="utf-8") as f:
+            data = yaml.safe_load(f) or {}
+        book = BookContent.from_dict(data)
+        self._book_cache[yaml_path] = (fingerprint, book)
+        return book
+
+    def save_book(self, book: BookContent, yaml_path: str) -> None:
+        """Write a ``BookContent`` back out as YAML."""
+        parent = os.path.dirname(yaml_path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        with open(yaml_path, "w", encoding="utf-8") as f:
+            yaml.dump(
+                book.to_dict(),
+                f,
+                Dumper=_BookDumper,
+                allow_unicode=True,
+                default_flow_style=False,
+            )
+
+    def load_all(self, max_workers: int = None) -> Dict[str, BookContent]:
+        """Load every book under ``books_dir``, in parallel.
+
+        Each parse is independent, so large collections fan out across a
+        process pool. Small collections use threads instead: libyaml's C
+        parser drops the GIL while scanning, and threads skip the process
+        spawn plus pickling of the results.
+        """
+        paths = self.list_books()
+        if not paths:
+            return {}
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        total_bytes = sum(os.path.getsize(p) for p in paths)
+        small = len(paths) < max_workers or total_bytes < 1 << 20
+        pool_cls = ThreadPoolExecutor if small else ProcessPoolExecutor
+        with pool_cls(max_workers=max_workers) as executor:
+            books = executor.map(self.load_book, paths)
+            return dict(zip(paths, books))
+
+    def list_books(self) -> List[str]:
+        """Return paths of all book YAML files under ``books_dir``."""
+        if not os.path.isdir(self.books_dir):
+            return []
+        return sorted(
+            os.path.join(self.books_dir, name)
+            for name in os.listdir(self.books_dir)
+            if name.endswith((".yaml", ".yml"))
+        )